@@ -3,12 +3,89 @@ from tkinter import ttk, messagebox, filedialog, simpledialog
 from tkinter.scrolledtext import ScrolledText
 import os
 import re
+import sys
 import json
-import base64
+import binascii
 import uuid
+import copy
+import functools
+import gzip
+import io
+import mmap
+import multiprocessing
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import orjson  # 可选依赖，提供更快的 JSON 编码和解码
+except ImportError:
+    orjson = None
+
+try:
+    import re2  # 可选依赖，线性时间的正则引擎，用于端口和参数扫描
+except ImportError:
+    re2 = None
+
+# 预处理用的正则表达式：行注释和块注释一次 sub 移除，宏定义语句单独识别
+# 解析器直接在内存映射的文件字节上匹配，因此以下正则表达式均为 bytes 模式
+_COMMENTS_RE = re.compile(rb"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_DEFINE_RE = re.compile(rb"`define[ \t]+(\w+)([^\n]*)")
+
+def _compile_scan(pattern):
+    """
+    编译模块头、端口和参数的扫描正则表达式。
+    安装了 re2 时优先使用 re2，否则（或 re2 不支持该模式时）使用标准库 re。
+
+    :param pattern: bytes 正则表达式，标志以内联形式（如 (?i)）写在模式开头
+    :return: 编译后的正则表达式对象
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+# 宏引用、模块头、端口和参数的正则表达式，在模块加载时编译一次
+# 宏引用用于带回调的替换，保持使用标准库 re
+_MACRO_USE_RE = re.compile(rb"`(\w+)")
+_MODULE_RE = _compile_scan(rb"(?si)module\s+(\w+)\s*(?:#\s*\(.*?\)\s*)?\s*\(?(.*?)\)?\s*;")
+_PORT_RE = _compile_scan(rb"(?i)(input|output|inout)\s*(wire|logic|reg)?\s*(?:\[([^\]]*?)\])?\s*(\w+)")
+# 无方向的端口列表项（Verilog-1995 头部），逐项完整匹配：[类型] [位宽] 端口名
+_PORT_NODIR_RE = _compile_scan(rb"(?i)^\s*(?:(wire|logic|reg)\s*)?(?:\[([^\]]*?)\]\s*)?(\w+)\s*$")
+_PARAM_RE = _compile_scan(rb"(?i)parameter\s+(?:type\s+)?\s*(\w+)\s*=\s*([^,;]+)")
+
+# 项目数据注释，由 save_project 追加在文件末尾
+_TOOL_DATA_RE = re.compile(rb"// VERILOG_TOOL_DATA: (\S+)")
+_TOOL_DATA_TAIL_SIZE = 64 * 1024  # 打开项目时优先扫描的文件末尾字节数
+
+_TOOL_DATA_CHUNK_SIZE = 57 * 1024  # 保存时每次 BASE64 编码的字节数，为 3 的倍数，分块编码结果与整体编码一致
+
+_PORT_TREE_BATCH_SIZE = 200  # 端口表格每批插入的行数，其余行在事件循环空闲时分批插入
+
+def _decode(raw):
+    """
+    将解析得到的字节串解码为字符串。
+
+    :param raw: 字节串
+    :return: 解码后的字符串，非法的 UTF-8 字节以替换字符表示
+    """
+    return raw.decode('utf-8', errors='replace')
+
+# 端口连接信息：连接类型（input/output/wire）和信号名
+Connection = namedtuple('Connection', ['conn_type', 'signal_name'])
+
+# 模块端口信息：名称、方向、数据类型、位宽和多维信息
+Port = namedtuple('Port', ['name', 'direction', 'dtype', 'width', 'dimensions'])
+
+# 模块参数信息：名称、默认值和类型
+Parameter = namedtuple('Parameter', ['name', 'value', 'type'])
 
 # 定义 Verilog 模块类，用于存储解析后的 Verilog 模块信息
 class VerilogModule:
+    __slots__ = ('name', 'filepath', 'ports', 'parameters', 'macros', '_port_index', '_param_index', '_basename',
+                 '_port_width_strs', '_parse_stamp')
+
     def __init__(self, name, filepath):
         """
         初始化 Verilog 模块对象。
@@ -18,9 +95,14 @@ class VerilogModule:
         """
         self.name = name
         self.filepath = filepath
-        self.ports = []  # 存储模块端口信息的列表
-        self.parameters = []  # 存储模块参数信息的列表
+        self._basename = os.path.basename(filepath)  # 文件名，用于列表显示
+        self.ports = []  # 存储模块端口信息（Port）的列表
+        self.parameters = []  # 存储模块参数信息（Parameter）的列表
         self.macros = {}  # 存储模块宏定义的字典
+        self._port_index = {}  # 端口名到端口信息的索引
+        self._param_index = {}  # 参数名到参数信息的索引
+        self._port_width_strs = {}  # 端口名到位宽声明字符串的索引，生成顶层模块时直接使用
+        self._parse_stamp = None  # 解析时文件的 (修改时间, 大小)，从项目数据恢复的模块为 None
 
     def add_port(self, name, direction, dtype, width, dimensions=None):
         """
@@ -34,13 +116,16 @@ class VerilogModule:
         """
         if dimensions is None:
             dimensions = []
-        self.ports.append({
-            'name': name,
-            'direction': direction,
-            'dtype': dtype,
-            'width': width,
-            'dimensions': dimensions  # 用于多维端口
-        })
+        # 方向、类型和位宽的取值很少，驻留后所有端口共享同一个字符串对象
+        # 端口名同时作为索引和连接字典的键，驻留后字典查找可按对象身份快速比较
+        name = sys.intern(name)
+        direction = sys.intern(direction)
+        dtype = sys.intern(dtype)
+        width = sys.intern(width)
+        self.ports.append(Port(name, direction, dtype, width, dimensions))
+        if name not in self._port_index:
+            self._port_index[name] = self.ports[-1]
+            self._port_width_strs[name] = VerilogGenerator._fmt_width(width)
 
     def add_parameter(self, name, value, ptype=None):
         """
@@ -50,11 +135,9 @@ class VerilogModule:
         :param value: 参数值
         :param ptype: 参数类型，默认为 None
         """
-        self.parameters.append({
-            'name': name,
-            'value': value,
-            'type': ptype
-        })
+        name = sys.intern(name)  # 参数名作为索引和参数值字典的键，驻留以加快查找
+        self.parameters.append(Parameter(name, value, ptype))
+        self._param_index.setdefault(name, self.parameters[-1])
 
     def add_macro(self, name, value):
         """
@@ -65,16 +148,31 @@ class VerilogModule:
         """
         self.macros[name] = value
 
+    def to_dict(self):
+        """
+        将模块信息转换为可序列化的字典。
+
+        :return: 包含文件路径、端口、参数和宏的字典
+        """
+        return {
+            "filepath": self.filepath,
+            "ports": [port._asdict() for port in self.ports],
+            "parameters": [param._asdict() for param in self.parameters],
+            "macros": self.macros
+        }
+
     def __str__(self):
         """
         返回模块名称和所在文件名的字符串表示。
 
         :return: 格式化后的字符串
         """
-        return f"{self.name} ({os.path.basename(self.filepath)})"
+        return f"{self.name} ({self._basename})"
 
 # 定义模块实例类，用于表示 Verilog 模块的实例
 class ModuleInstance:
+    __slots__ = ('module_ref', 'instance_name', 'connections', 'parameter_values')
+
     def __init__(self, module_ref, instance_name):
         """
         初始化模块实例对象。
@@ -84,7 +182,7 @@ class ModuleInstance:
         """
         self.module_ref = module_ref
         self.instance_name = instance_name
-        self.connections = {}  # 端口连接信息，键为端口名，值为 (连接类型, 信号名)
+        self.connections = {}  # 端口连接信息，键为端口名，值为 Connection(连接类型, 信号名)
         self.parameter_values = {}  # 参数值信息，键为参数名，值为参数值
 
     def get_port_info(self, port_name):
@@ -92,228 +190,381 @@ class ModuleInstance:
         根据端口名获取端口信息。
 
         :param port_name: 端口名称
-        :return: 端口信息字典，如果未找到则返回 None
+        :return: 端口信息（Port），如果未找到则返回 None
         """
-        for port in self.module_ref.ports:
-            if port['name'] == port_name:
-                return port
-        return None
+        return self.module_ref._port_index.get(port_name)
 
     def get_parameter_info(self, param_name):
         """
         根据参数名获取参数信息。
 
         :param param_name: 参数名称
-        :return: 参数信息字典，如果未找到则返回 None
+        :return: 参数信息（Parameter），如果未找到则返回 None
+        """
+        return self.module_ref._param_index.get(param_name)
+
+    def to_dict(self):
+        """
+        将实例信息转换为可序列化的字典。
+
+        :return: 包含模块名、实例名、连接和参数值的字典
+        """
+        return {
+            "module": self.module_ref.name,
+            "instance_name": self.instance_name,
+            "connections": {port_name: list(conn) for port_name, conn in self.connections.items()},
+            "parameter_values": self.parameter_values
+        }
+
+# 定义预处理器类，依次移除注释、收集宏定义并展开宏引用，每一步是一次正则 sub
+class _Preprocessor:
+    def __init__(self, content):
+        """
+        初始化预处理器。
+
+        :param content: Verilog 源码内容（bytes 或内存映射对象）
+        """
+        self.content = content
+        self.macros = {}  # 已定义的宏，键为宏名，值为未展开的原始宏值
+
+    def expand(self, text, visited=frozenset()):
+        """
+        展开文本中引用的已定义宏，宏值中引用的宏递归展开，未定义的宏保持原样。
+
+        :param text: 待展开的文本（bytes）
+        :param visited: 正在展开的宏名集合，用于避免循环引用导致无限递归
+        :return: 展开后的文本
+        """
+        if b'`' not in text or not self.macros:
+            return text
+        macros = self.macros
+
+        def replace(match):
+            name = match.group(1)
+            value = macros.get(name)
+            if value is None or name in visited:
+                return match.group(0)
+            return self.expand(value, visited | {name})
+
+        return _MACRO_USE_RE.sub(replace, text)
+
+    def _record_define(self, match):
         """
-        for param in self.module_ref.parameters:
-            if param['name'] == param_name:
-                return param
-        return None
+        记录一条宏定义（保存原始宏值，使用时再展开），并将宏定义语句从源码中移除。
+
+        :param match: 宏定义语句的匹配对象
+        :return: 替换文本（空字节串）
+        """
+        self.macros[match.group(1)] = match.group(2).strip()
+        return b""
+
+    def preprocess(self):
+        """
+        移除注释和宏定义语句并展开宏引用。
+        每一步都是一次在 C 层完成的 sub，只有宏定义和宏引用才会回调 Python。
+
+        :return: 预处理后的源码（bytes）
+        """
+        content = self.content
+
+        # 移除注释，没有注释时跳过
+        if content.find(b"//") >= 0 or content.find(b"/*") >= 0:
+            content = _COMMENTS_RE.sub(b"", content)
+        else:
+            content = bytes(content)
+
+        # 收集宏定义，存在宏定义时才展开宏引用
+        if b"`define" in content:
+            content = _DEFINE_RE.sub(self._record_define, content)
+            if self.macros:
+                content = self.expand(content)
+        return content
 
 # 定义 Verilog 文件解析器类，用于解析 Verilog 文件
 class VerilogParser:
+    # 解析结果缓存：文件路径 -> (修改时间, 文件大小, VerilogModule)，每个文件只保留最新一份
+    # 按最近使用顺序排列，超过上限时淘汰最久未使用的文件
+    _cache = OrderedDict()
+    _cache_maxsize = 1000
+
     @staticmethod
     def parse_verilog_file(filepath):
         """
         解析 Verilog 文件，提取模块、端口、参数和宏信息。
+        文件未修改时直接复用缓存的解析结果。
 
         :param filepath: Verilog 文件路径
         :return: VerilogModule 对象，如果解析失败则返回 None
         """
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            st = os.stat(filepath)
         except Exception as e:
             raise ValueError(f"Error reading file: {str(e)}")
 
-        # 预处理：移除注释
-        content = re.sub(r"//.*?$", "", content, flags=re.MULTILINE)
-        content = re.sub(r"/\*.*?\*/", "", content, flags=re.DOTALL)
+        # 修改时间和大小都未变化时复用缓存，否则重新解析并替换该文件的旧结果
+        cache = VerilogParser._cache
+        cached = cache.get(filepath)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            module = cached[2]
+            cache.move_to_end(filepath)
+        else:
+            module = VerilogParser._parse_file(filepath)
+            if module is not None:
+                module._parse_stamp = (st.st_mtime_ns, st.st_size)
+            VerilogParser._store_cached(filepath, st.st_mtime_ns, st.st_size, module)
 
-        # 预处理宏
-        macros = {}
-        macro_pattern = r"`define\s+(\w+)\s+(.+)"
-        for match in re.finditer(macro_pattern, content):
-            macro_name = match.group(1)
-            macro_value = match.group(2).strip()
-            macros[macro_name] = macro_value
+        # 返回副本，避免调用方修改模块时污染缓存
+        return copy.deepcopy(module)
 
-        # 应用宏
-        for macro, value in macros.items():
-            content = content.replace(f"`{macro}", value)
+    @staticmethod
+    def get_cached(filepath):
+        """
+        查询文件的缓存解析结果，不会触发解析。
+
+        :param filepath: Verilog 文件路径
+        :return: 文件未修改且缓存中有模块时返回 VerilogModule 副本，否则返回 None
+        """
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+
+        cache = VerilogParser._cache
+        cached = cache.get(filepath)
+        if cached is None or cached[2] is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+            return None
+        cache.move_to_end(filepath)
+        return copy.deepcopy(cached[2])
+
+    @staticmethod
+    def store_parsed(filepath, module):
+        """
+        将在其他进程中解析得到的模块存入本进程的缓存。
+
+        :param filepath: Verilog 文件路径
+        :param module: 解析得到的 VerilogModule 对象，需带有解析时的文件时间戳
+        """
+        if module is None or module._parse_stamp is None:
+            return
+        mtime, size = module._parse_stamp
+        VerilogParser._store_cached(filepath, mtime, size, copy.deepcopy(module))
+
+    @staticmethod
+    def _store_cached(filepath, mtime, size, module):
+        """
+        写入缓存并按最近使用顺序淘汰超出上限的条目。
+
+        :param filepath: Verilog 文件路径
+        :param mtime: 文件修改时间（纳秒）
+        :param size: 文件大小
+        :param module: VerilogModule 对象，解析失败时为 None
+        """
+        cache = VerilogParser._cache
+        cache[filepath] = (mtime, size, module)
+        cache.move_to_end(filepath)
+        if len(cache) > VerilogParser._cache_maxsize:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _parse_file(filepath):
+        """
+        读取并解析 Verilog 文件，不经过缓存。
+
+        :param filepath: Verilog 文件路径
+        :return: VerilogModule 对象，如果解析失败则返回 None
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                # 空文件无法映射，也不可能包含模块
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                # 映射文件而不是整体读入，由内核按需换页
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # 预处理：移除注释、收集宏定义并展开宏引用（至多三次 sub，没有注释或宏时跳过对应步骤）
+                    preprocessor = _Preprocessor(mm)
+                    content = preprocessor.preprocess()
+        except Exception as e:
+            raise ValueError(f"Error reading file: {str(e)}")
+        macros = preprocessor.macros
 
         # 查找模块 - 更健壮的正则表达式
-        module_pattern = r"module\s+(\w+)\s*(?:#\s*\(.*?\)\s*)?\s*\(?(.*?)\)?\s*;"
-        module_match = re.search(module_pattern, content, re.DOTALL | re.IGNORECASE)
+        module_match = _MODULE_RE.search(content)
         if not module_match:
             return None
 
-        module_name = module_match.group(1)
+        module_name = _decode(module_match.group(1))
         module = VerilogModule(module_name, filepath)
 
         # 提取端口
         port_section = module_match.group(2)
         # 增强的端口正则表达式，用于捕获各种格式的端口
-        port_pattern = r"(input|output|inout)\s*(wire|logic|reg)?\s*(?:\[([^\]]*?)\])?\s*(\w+)"
-
-        port_matches = []
-        for match in re.finditer(port_pattern, port_section, re.IGNORECASE):
-            port_matches.append(match)
-
-        if not port_matches:
+        found_any = False
+        for match in _PORT_RE.finditer(port_section):
+            found_any = True
+            direction = _decode(match.group(1)).lower()
+            dtype = _decode(match.group(2)).lower() if match.group(2) else "wire"
+            width = _decode(match.group(3)).strip() if match.group(3) else "1"
+            module.add_port(_decode(match.group(4)), direction, dtype, width)
+
+        if not found_any:
             # 尝试无方向的替代正则表达式
-            port_pattern = r"(\w+)\s*(wire|logic|reg)?\s*(?:\[([^\]]*?)\])?\s*$"
-            for match in re.finditer(port_pattern, port_section, re.IGNORECASE):
-                port_matches.append(match)
-
-        for match in port_matches:
-            direction = match.group(1).lower() if match.group(1) else "wire"
-            dtype = match.group(2).lower() if match.group(2) else "wire"
-            width = match.group(3).strip() if match.group(3) else "1"
-            name = match.group(4)
-            module.add_port(name, direction, dtype, width)
+            # 按逗号拆分后逐项匹配，任何一项无法识别时报告解析错误，避免生成不完整的模块
+            for item in port_section.split(b","):
+                if not item.strip():
+                    continue
+                match = _PORT_NODIR_RE.match(item)
+                if not match:
+                    raise ValueError(f"Could not parse port list entry: {_decode(item).strip()}")
+                dtype = _decode(match.group(1)).lower() if match.group(1) else "wire"
+                width = _decode(match.group(2)).strip() if match.group(2) else "1"
+                module.add_port(_decode(match.group(3)), "wire", dtype, width)
 
         # 提取参数 - 更健壮的正则表达式
-        param_pattern = r"parameter\s+(?:type\s+)?\s*(\w+)\s*=\s*([^,;]+)"
-        for match in re.finditer(param_pattern, content, re.IGNORECASE):
-            name = match.group(1)
-            value = match.group(2).strip()
-            # 尝试检测类型
+        # 源码中没有 parameter 关键字时跳过参数扫描
+        # 与 _PARAM_RE 一样不区分大小写：转小写后做子串查找，两步都在 C 层完成，远快于一次正则扫描
+        param_matches = _PARAM_RE.finditer(content) if b"parameter" in content.lower() else ()
+        for match in param_matches:
+            name = _decode(match.group(1))
+            value = _decode(match.group(2)).strip()
+            # 尝试检测类型：根据首字符判断
+            first = value[:1]
             ptype = None
-            if re.match(r"^\d", value):
+            if first.isdigit():
                 ptype = "int"
-            elif re.match(r"^[\"\']", value):
+            elif first in ('"', "'"):
                 ptype = "string"
             module.add_parameter(name, value, ptype)
 
         # 存储宏
         for macro, value in macros.items():
-            module.add_macro(macro, value)
+            module.add_macro(_decode(macro), _decode(value))
 
         return module
 
+def _parse_in_worker(filepath):
+    """
+    在后台解析进程中解析 Verilog 文件。
+    子进程中的缓存不会被读取，因此直接解析并返回结果，不写缓存也不复制模块。
+
+    :param filepath: Verilog 文件路径
+    :return: 带有解析时文件时间戳的 VerilogModule 对象，如果解析失败则返回 None
+    """
+    try:
+        st = os.stat(filepath)
+    except Exception as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+    module = VerilogParser._parse_file(filepath)
+    if module is not None:
+        module._parse_stamp = (st.st_mtime_ns, st.st_size)
+    return module
+
 # 定义 Verilog 代码生成器类，用于生成顶层模块的 Verilog 代码
 class VerilogGenerator:
     @staticmethod
-    def generate_top_module(instances, top_module_name):
+    @functools.lru_cache(maxsize=4096)
+    def _fmt_width(width):
+        """
+        格式化端口位宽声明：[width-1:0]，如果位宽为 1 则省略。
+
+        :param width: 端口位宽
+        :return: 位宽声明字符串（含前导空格），位宽为 1 时返回空字符串
+        """
+        if width == "1":
+            return ""
+        if ':' in width:
+            # 已经是 [msb:lsb] 格式
+            return f" [{width}]"
+        if not width.isdecimal():
+            # 如果不是数字，原样使用（先判断再转换，避免异常处理的开销）
+            return f" [{width}]"
+        # 转换为 [width-1:0]
+        w_val = int(width)
+        return f" [{w_val-1}:0]" if w_val > 1 else ""
+
+    @staticmethod
+    def generate_top_module(instances, top_module_name, out=None):
         """
         根据模块实例列表生成顶层模块的 Verilog 代码。
 
         :param instances: 模块实例列表
         :param top_module_name: 顶层模块名称
-        :return: 生成的 Verilog 代码字符串
+        :param out: 可选的文本输出流（如已打开的文件），指定时代码直接写入该流
+        :return: 生成的 Verilog 代码字符串；指定 out 时返回 None
         """
-        lines = []
-        lines.append(f"// Auto-generated top module: {top_module_name}")
-        lines.append(f"module {top_module_name} (")
+        buf = io.StringIO() if out is None else out
+        write = buf.write
+        write(f"// Auto-generated top module: {top_module_name}\n")
+        write(f"module {top_module_name} (\n")
 
-        # 收集顶层端口（input/output）
+        # 单次遍历连接，同时收集顶层端口（input/output）和线网（wire）
         top_ports = []
+        wires = {}
         for instance in instances:
-            for port_name, (conn_type, signal_name) in instance.connections.items():
-                port_info = instance.get_port_info(port_name)
+            # 直接使用模块的端口索引和预先计算的位宽声明，避免内层循环中的方法调用
+            port_index = instance.module_ref._port_index
+            width_strs = instance.module_ref._port_width_strs
+            for port_name, conn in instance.connections.items():
+                conn_type, signal_name = conn.conn_type, conn.signal_name
+                port_info = port_index.get(port_name)
                 if not port_info or not signal_name:
                     continue
 
-                direction = port_info['direction']
-                width = port_info['width']
-
-                # 格式化位宽：[width-1:0]，如果位宽为 1 则省略
-                width_str = ""
-                if width != "1":
-                    try:
-                        # 尝试解析位宽表达式
-                        if ':' in width:
-                            # 已经是 [msb:lsb] 格式
-                            width_str = f" [{width}]"
-                        else:
-                            # 转换为 [width-1:0]
-                            w_val = int(width)
-                            if w_val > 1:
-                                width_str = f" [{w_val-1}:0]"
-                    except:
-                        # 如果不是数字，原样使用
-                        if width != "1":
-                            width_str = f" [{width}]"
-
-                # 仅为 input/output 连接创建顶层端口
-                if conn_type == "input" and direction == "input":
+                width_str = width_strs[port_name]
+                direction = port_info.direction
+
+                if conn_type == "wire":
+                    wires[signal_name] = width_str
+                elif conn_type == "input" and direction == "input":
                     top_ports.append(f"input wire{width_str} {signal_name}")
                 elif conn_type == "output" and direction == "output":
                     top_ports.append(f"output wire{width_str} {signal_name}")
 
         # 添加顶层端口
         if top_ports:
-            lines.append(",\n  ".join(top_ports))
+            for i, top_port in enumerate(top_ports):
+                if i:
+                    write(",\n  ")
+                write(top_port)
+            write("\n")
 
-        lines.append(");\n")
+        write(");\n\n")
 
         # 线网声明
-        wires = {}
-        for instance in instances:
-            for port_name, (conn_type, signal_name) in instance.connections.items():
-                port_info = instance.get_port_info(port_name)
-                if not port_info or not signal_name:
-                    continue
-
-                # 仅为 wire 连接创建线网
-                if conn_type == "wire":
-                    width = port_info['width']
-
-                    # 格式化位宽：[width-1:0]，如果位宽为 1 则省略
-                    width_str = ""
-                    if width != "1":
-                        try:
-                            # 尝试解析位宽表达式
-                            if ':' in width:
-                                # 已经是 [msb:lsb] 格式
-                                width_str = f" [{width}]"
-                            else:
-                                # 转换为 [width-1:0]
-                                w_val = int(width)
-                                if w_val > 1:
-                                    width_str = f" [{w_val-1}:0]"
-                        except:
-                            # 如果不是数字，原样使用
-                            if width != "1":
-                                width_str = f" [{width}]"
-
-                    wires[signal_name] = width_str
-
         for signal_name, width_str in wires.items():
-            lines.append(f"  wire{width_str} {signal_name};")
+            write(f"  wire{width_str} {signal_name};\n")
         if wires:
-            lines.append("")
+            write("\n")
 
         # 模块实例化
         for instance in instances:
-            lines.append(f"  // Source: {instance.module_ref.filepath}")
-            param_strs = []
-            for param in instance.module_ref.parameters:
-                param_name = param['name']
-                value = instance.parameter_values.get(param_name, param['value'])
-                param_strs.append(f".{param_name}({value})")
-
-            port_strs = []
-            for port in instance.module_ref.ports:
-                port_name = port['name']
-                if port_name in instance.connections:
-                    conn_type, signal_name = instance.connections[port_name]
-                    port_strs.append(f".{port_name}({signal_name})")
+            module_ref = instance.module_ref
+            write(f"  // Source: {module_ref.filepath}\n")
+            write(f"  {module_ref.name}")
+
+            if module_ref.parameters:
+                write(" #(\n    ")
+                for i, param in enumerate(module_ref.parameters):
+                    if i:
+                        write(",\n    ")
+                    param_name = param.name
+                    value = instance.parameter_values.get(param_name, param.value)
+                    write(f".{param_name}({value})")
+                write("\n  )")
+
+            write(f" {instance.instance_name} (\n")
+            for i, port in enumerate(module_ref.ports):
+                if i:
+                    write(",\n    ")
+                port_name = port.name
+                conn = instance.connections.get(port_name)
+                if conn is not None:
+                    write(f".{port_name}({conn.signal_name})")
                 else:
-                    port_strs.append(f".{port_name}()")
+                    write(f".{port_name}()")
+            write("\n  );\n\n")
 
-            param_conn = ""
-            if param_strs:
-                param_conn = " #(\n    " + ",\n    ".join(param_strs) + "\n  )"
-
-            lines.append(f"  {instance.module_ref.name}{param_conn} {instance.instance_name} (")
-            lines.append(",\n    ".join(port_strs))
-            lines.append("  );\n")
-
-        lines.append("endmodule")
-        return "\n".join(lines)
+        write("endmodule")
+        return buf.getvalue() if out is None else None
 
 # 定义 Verilog 集成工具类，继承自 tkinter.Tk，用于创建 GUI 应用
 class VerilogIntegrationTool(tk.Tk):
@@ -326,10 +577,29 @@ class VerilogIntegrationTool(tk.Tk):
         self.geometry("1000x700")
 
         self.modules = {}  # 存储模块信息，键为模块名，值为 VerilogModule 对象
-        self.instances = []  # 存储模块实例列表
+        self._module_list_names = []  # 模块列表每一行对应的模块名，与 module_list 同步
+        self._instance_list_refs = []  # 实例列表每一行对应的 ModuleInstance 对象，与 instance_list 同步
+        self.instances = {}  # 按实例名索引 ModuleInstance 对象，实例顺序以 _instance_list_refs 为准
+        self._instances_per_module = Counter()  # 每个模块名对应的实例数量
         self.current_instance = None  # 当前选中的模块实例
         self.drag_data = {"item": None}  # 拖拽数据
-        self.editing_cell = None  # 当前正在编辑的表格单元格
+        self._drag_scheduled = False  # 是否已安排处理拖拽移动事件
+        self._drag_bg_current = "#fffacd"  # 实例列表当前的背景颜色
+        self.editing_cell = None  # 当前正在编辑的表格单元格：(行 iid, 列, 编辑类型, 所属实例)
+        self._last_rendered_instance = None  # 端口表格当前显示的实例，用于跳过重复刷新
+        self._port_fill_job = None  # 端口表格分批插入的待执行任务
+        self._log_queue = deque(maxlen=10000)  # 待写入输出框的日志消息
+        self._log_flush_scheduled = False  # 是否已安排写入日志
+        self.connection_combobox = None  # 连接类型下拉框，首次编辑时创建
+        self.name_entry = None  # 信号名称输入框，首次编辑时创建
+        self.param_entry = None  # 参数值输入框，首次编辑时创建
+        # 后台解析 Verilog 文件的进程池，解析为纯 Python 计算，多进程可绕开 GIL
+        # 使用 spawn 启动子进程，避免 fork 已持有 Tk/Tcl 解释器的进程
+        # Python 3.6 的 ProcessPoolExecutor 不支持指定启动方式，退回线程池
+        if sys.version_info >= (3, 7):
+            self._parse_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self._parse_pool = ThreadPoolExecutor()
 
         self.setup_ui()  # 初始化 UI
         self.setup_menus()  # 初始化菜单
@@ -406,25 +676,8 @@ class VerilogIntegrationTool(tk.Tk):
         self.port_tree.tag_configure('port', background='#f0f0f0')
         self.port_tree.tag_configure('parameter', background='#e0f0ff')
 
-        # 创建下拉框和输入框控件
-        self.connection_combobox = ttk.Combobox(self.port_tree)
-        self.name_entry = ttk.Entry(self.port_tree)
-        self.param_entry = ttk.Entry(self.port_tree)
-
-        # 初始隐藏这些控件
-        self.connection_combobox.place_forget()
-        self.name_entry.place_forget()
-        self.param_entry.place_forget()
-
-        # 绑定编辑事件
+        # 绑定编辑事件（下拉框和输入框控件在第一次编辑时创建）
         self.port_tree.bind("<ButtonRelease-1>", self.on_tree_click)
-        self.connection_combobox.bind("<<ComboboxSelected>>", self.on_connection_select)
-        self.connection_combobox.bind("<Return>", self.on_connection_select)
-        self.connection_combobox.bind("<FocusOut>", self.on_connection_select)
-        self.name_entry.bind("<Return>", self.on_name_enter)
-        self.name_entry.bind("<FocusOut>", self.on_name_enter)
-        self.param_entry.bind("<Return>", self.on_param_enter)
-        self.param_entry.bind("<FocusOut>", self.on_param_enter)
 
         # 底部输出框架
         output_frame = tk.LabelFrame(self, text="Output")
@@ -450,34 +703,84 @@ class VerilogIntegrationTool(tk.Tk):
 
     def log(self, message):
         """
-        在输出框中记录日志信息。
+        在输出框中记录日志信息。消息先进入队列，每 100 毫秒合并写入一次。
 
         :param message: 要记录的日志消息
         """
+        self._log_queue.append(message)
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.after(100, self._flush_log)
+
+    def _flush_log(self):
+        """
+        将队列中的日志消息一次性写入输出框。
+        """
+        self._log_flush_scheduled = False
+        if not self._log_queue:
+            return
+        text = "\n".join(self._log_queue) + "\n"
+        self._log_queue.clear()
+
         self.output_text.config(state=tk.NORMAL)
-        self.output_text.insert(tk.END, message + "\n")
+        self.output_text.insert(tk.END, text)
         self.output_text.see(tk.END)
         self.output_text.config(state=tk.DISABLED)
 
     def open_module(self):
         """
-        打开 Verilog 文件并解析模块信息。
+        打开一个或多个 Verilog 文件，在后台进程中解析模块信息。
         """
-        filepath = filedialog.askopenfilename(
+        filepaths = filedialog.askopenfilenames(
             filetypes=[("Verilog Files", "*.v *.sv"), ("All Files", "*.*")]
         )
 
-        if not filepath:
+        if not filepaths:
             return
 
+        # 未修改的文件直接使用本进程的缓存，其余文件同时提交解析，结果按选择顺序回到主线程处理
+        pending = []
+        for filepath in filepaths:
+            module = VerilogParser.get_cached(filepath)
+            if module is not None:
+                future = Future()
+                future.set_result(module)
+            else:
+                future = self._parse_pool.submit(_parse_in_worker, filepath)
+            pending.append((filepath, future))
+        self._poll_parse(pending)
+
+    def _poll_parse(self, pending):
+        """
+        在主线程中轮询后台解析任务，将已完成的模块加入模块库。
+
+        :param pending: 待处理的 (文件路径, Future) 列表，按打开顺序排列
+        """
+        while pending and pending[0][1].done():
+            filepath, future = pending.pop(0)
+            self._add_parsed_module(filepath, future)
+
+        if pending:
+            self.after(50, self._poll_parse, pending)
+
+    def _add_parsed_module(self, filepath, future):
+        """
+        将后台解析的结果加入模块库并记录日志。
+
+        :param filepath: Verilog 文件路径
+        :param future: 已完成的解析任务
+        """
         try:
-            module = VerilogParser.parse_verilog_file(filepath)
+            module = future.result()
             if module:
+                # 子进程中的缓存对主进程不可见，将结果存入主进程的缓存
+                VerilogParser.store_parsed(filepath, module)
                 self.modules[module.name] = module
                 self.module_list.insert(tk.END, str(module))
+                self._module_list_names.append(module.name)
                 self.log(f"Successfully parsed module: {module.name}")
-                self.log(f"  Ports: {[port['name'] for port in module.ports]}")
-                self.log(f"  Parameters: {[param['name'] for param in module.parameters]}")
+                self.log(f"  Ports: {[port.name for port in module.ports]}")
+                self.log(f"  Parameters: {[param.name for param in module.parameters]}")
             else:
                 self.log(f"Error: Could not parse module from {filepath}")
         except Exception as e:
@@ -494,7 +797,7 @@ class VerilogIntegrationTool(tk.Tk):
             return
 
         index = selection[0]
-        module_name = self.module_list.get(index).split()[0]
+        module_name = self._module_list_names[index]
         module = self.modules.get(module_name)
 
         if not module:
@@ -528,10 +831,10 @@ class VerilogIntegrationTool(tk.Tk):
         # 向 Treeview 表格添加端口信息
         for port in module.ports:
             port_tree.insert("", tk.END, values=(
-                port['name'],
-                port['direction'],
-                port['dtype'],
-                port['width']
+                port.name,
+                port.direction,
+                port.dtype,
+                port.width
             ))
 
         # 参数标签页
@@ -550,11 +853,11 @@ class VerilogIntegrationTool(tk.Tk):
 
         # 向 Treeview 表格添加参数信息
         for param in module.parameters:
-            ptype = param['type'] if param['type'] else "value"
+            ptype = param.type if param.type else "value"
             param_tree.insert("", tk.END, values=(
-                param['name'],
+                param.name,
                 ptype,
-                param['value']
+                param.value
             ))
 
         # 宏标签页
@@ -594,12 +897,37 @@ class VerilogIntegrationTool(tk.Tk):
         if self.drag_data["item"] is None:
             return
 
+        # 记录最新位置，每 30ms 最多处理一次移动事件
+        self.drag_data["pos"] = (event.x_root, event.y_root)
+        if self._drag_scheduled:
+            return
+        self._drag_scheduled = True
+        self.after(30, self._do_drag)
+
+    def _do_drag(self):
+        """
+        处理节流后的拖拽移动，根据最新的鼠标位置高亮实例列表。
+        """
+        self._drag_scheduled = False
+        if self.drag_data["item"] is None:
+            return
+
         # 检查是否在实例列表上方
-        target_widget = self.instance_list.winfo_containing(event.x_root, event.y_root)
+        target_widget = self.instance_list.winfo_containing(*self.drag_data["pos"])
         if target_widget == self.instance_list:
-            self.instance_list.config(bg="#ffffe0")  # 高亮显示
+            self._set_instance_list_bg("#ffffe0")  # 高亮显示
         else:
-            self.instance_list.config(bg="#fffacd")  # 恢复正常颜色
+            self._set_instance_list_bg("#fffacd")  # 恢复正常颜色
+
+    def _set_instance_list_bg(self, color):
+        """
+        设置实例列表的背景颜色，颜色未变化时不触发重绘。
+
+        :param color: 背景颜色
+        """
+        if color != self._drag_bg_current:
+            self.instance_list.config(bg=color)
+            self._drag_bg_current = color
 
     def drop_module(self, event):
         """
@@ -614,7 +942,7 @@ class VerilogIntegrationTool(tk.Tk):
         target_widget = self.instance_list.winfo_containing(event.x_root, event.y_root)
         if target_widget == self.instance_list:
             index = self.drag_data["item"]
-            module_name = self.module_list.get(index).split()[0]
+            module_name = self._module_list_names[index]
             module = self.modules.get(module_name)
 
             if module:
@@ -627,17 +955,19 @@ class VerilogIntegrationTool(tk.Tk):
 
                 if instance_name:
                     # 检查实例名称是否已存在
-                    if any(inst.instance_name == instance_name for inst in self.instances):
+                    if instance_name in self.instances:
                         messagebox.showerror("Error", f"Instance name '{instance_name}' already exists!")
                     else:
                         # 创建新实例
                         instance = ModuleInstance(module, instance_name)
-                        self.instances.append(instance)
+                        self.instances[instance_name] = instance
+                        self._instances_per_module[module_name] += 1
                         self.instance_list.insert(tk.END, instance_name)
+                        self._instance_list_refs.append(instance)
                         self.log(f"Instantiated module: {module_name} as {instance_name}")
 
         # 重置拖拽数据和背景颜色
-        self.instance_list.config(bg="#fffacd")
+        self._set_instance_list_bg("#fffacd")
         self.drag_data = {"item": None}
 
     def select_instance(self, event):
@@ -650,53 +980,93 @@ class VerilogIntegrationTool(tk.Tk):
         if not selection:
             return
 
-        index = selection[0]
-        instance_name = self.instance_list.get(index)
+        # 直接取得该行对应的实例
+        self.current_instance = self._instance_list_refs[selection[0]]
+        self.update_port_tree()
 
-        # 查找实例
-        for instance in self.instances:
-            if instance.instance_name == instance_name:
-                self.current_instance = instance
-                self.update_port_tree()
-                return
+    def _clear_port_tree(self):
+        """
+        清空端口和参数表格，一次调用删除所有行，并取消尚未完成的分批插入。
+        """
+        if self._port_fill_job is not None:
+            self.after_cancel(self._port_fill_job)
+            self._port_fill_job = None
+        children = self.port_tree.get_children()
+        if children:
+            self.port_tree.delete(*children)
+        self._last_rendered_instance = None
 
     def update_port_tree(self):
         """
         更新端口和参数表格的显示内容。
         """
+        # 表格已显示该实例时无需重建，编辑单元格时对应的行会被原地更新
+        if self.current_instance is not None and self.current_instance is self._last_rendered_instance:
+            return
+
         # 清空表格
-        for item in self.port_tree.get_children():
-            self.port_tree.delete(item)
+        self._clear_port_tree()
 
         if not self.current_instance:
             return
 
+        # 行的 iid 为 "port:端口名" 或 "param:参数名"，编辑时直接从 iid 取得名称
+        inserted = set()
+        rows = []  # (iid, 各列的值, 标签)
+
         # 添加端口信息
+        connections = self.current_instance.connections
+        empty_connection = Connection("", "")
         for port in self.current_instance.module_ref.ports:
-            # 获取连接信息（如果存在）
-            conn_type = ""
-            signal_name = ""
-            if port['name'] in self.current_instance.connections:
-                conn_type, signal_name = self.current_instance.connections[port['name']]
-
-            self.port_tree.insert("", tk.END, values=(
-                f"{port['name']} ({port['direction']} {port['dtype']} {port['width']})",
+            iid = f"port:{port.name}"
+            if iid in inserted:
+                continue
+            inserted.add(iid)
+
+            # 获取连接信息（如果存在），一次字典查找
+            conn_type, signal_name = connections.get(port.name, empty_connection)
+
+            rows.append((iid, (
+                f"{port.name} ({port.direction} {port.dtype} {port.width})",
                 conn_type,
                 signal_name
-            ), tags=('port',))
+            ), ('port',)))
 
         # 添加参数信息
         for param in self.current_instance.module_ref.parameters:
+            iid = f"param:{param.name}"
+            if iid in inserted:
+                continue
+            inserted.add(iid)
+
             value = self.current_instance.parameter_values.get(
-                param['name'],
-                param['value']
+                param.name,
+                param.value
             )
-            ptype = param['type'] if param['type'] else "value"
-            self.port_tree.insert("", tk.END, values=(
-                f"parameter {param['name']} ({ptype})",
+            ptype = param.type if param.type else "value"
+            rows.append((iid, (
+                f"parameter {param.name} ({ptype})",
                 value,
                 ""
-            ), tags=('parameter',))
+            ), ('parameter',)))
+
+        self._last_rendered_instance = self.current_instance
+        self._fill_port_tree(rows, 0)
+
+    def _fill_port_tree(self, rows, start):
+        """
+        向端口表格插入一批行，剩余的行安排在下一次事件循环中继续插入，
+        端口很多时界面不会因一次性插入而卡顿。
+
+        :param rows: 待插入的 (iid, 各列的值, 标签) 列表
+        :param start: 本批插入的起始位置
+        """
+        self._port_fill_job = None
+        end = start + _PORT_TREE_BATCH_SIZE
+        for iid, values, tags in rows[start:end]:
+            self.port_tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+        if end < len(rows):
+            self._port_fill_job = self.after(1, self._fill_port_tree, rows, end)
 
     def on_tree_click(self, event):
         """
@@ -723,10 +1093,10 @@ class VerilogIntegrationTool(tk.Tk):
         # 获取单元格坐标
         x, y, width, height = self.port_tree.bbox(item, column)
 
-        # 先隐藏所有编辑控件
-        self.connection_combobox.place_forget()
-        self.name_entry.place_forget()
-        self.param_entry.place_forget()
+        # 先隐藏所有已创建的编辑控件
+        for editor in (self.connection_combobox, self.name_entry, self.param_entry):
+            if editor is not None:
+                editor.place_forget()
 
         # 判断是端口还是参数
         is_port = 'port' in tags
@@ -735,29 +1105,42 @@ class VerilogIntegrationTool(tk.Tk):
         if is_port:
             if col_index == 1:  # 连接类型列
                 # 创建下拉框显示连接选项
+                if self.connection_combobox is None:
+                    self.connection_combobox = ttk.Combobox(self.port_tree)
+                    self.connection_combobox.bind("<<ComboboxSelected>>", self.on_connection_select)
+                    self.connection_combobox.bind("<Return>", self.on_connection_select)
+                    self.connection_combobox.bind("<FocusOut>", self.on_connection_select)
                 options = ["input", "output", "wire"]
                 self.connection_combobox.config(values=options)
                 self.connection_combobox.set(current_value)
                 self.connection_combobox.place(x=x, y=y, width=width, height=height)
                 self.connection_combobox.focus_set()
                 self.connection_combobox.selection_range(0, tk.END)
-                self.editing_cell = (item, column, "connection")
+                self.editing_cell = (item, column, "connection", self.current_instance)
 
             elif col_index == 2:  # 信号名称列
+                if self.name_entry is None:
+                    self.name_entry = ttk.Entry(self.port_tree)
+                    self.name_entry.bind("<Return>", self.on_name_enter)
+                    self.name_entry.bind("<FocusOut>", self.on_name_enter)
                 self.name_entry.delete(0, tk.END)
                 self.name_entry.insert(0, current_value)
                 self.name_entry.place(x=x, y=y, width=width, height=height)
                 self.name_entry.focus_set()
                 self.name_entry.selection_range(0, tk.END)
-                self.editing_cell = (item, column, "name")
+                self.editing_cell = (item, column, "name", self.current_instance)
 
         elif is_parameter and col_index == 1:  # 参数值列
+            if self.param_entry is None:
+                self.param_entry = ttk.Entry(self.port_tree)
+                self.param_entry.bind("<Return>", self.on_param_enter)
+                self.param_entry.bind("<FocusOut>", self.on_param_enter)
             self.param_entry.delete(0, tk.END)
             self.param_entry.insert(0, current_value)
             self.param_entry.place(x=x, y=y, width=width, height=height)
             self.param_entry.focus_set()
             self.param_entry.selection_range(0, tk.END)
-            self.editing_cell = (item, column, "parameter")
+            self.editing_cell = (item, column, "parameter", self.current_instance)
 
     def on_connection_select(self, event=None):
         """
@@ -768,21 +1151,21 @@ class VerilogIntegrationTool(tk.Tk):
         if not self.editing_cell or self.editing_cell[2] != "connection":
             return
 
-        item, column, _ = self.editing_cell
+        item, column, _, instance = self.editing_cell
         new_value = self.connection_combobox.get()
 
-        # 更新表格值
-        values = list(self.port_tree.item(item, "values"))
-        values[1] = new_value
-        self.port_tree.item(item, values=values)
+        # 更新表格值（编辑期间表格可能已切换到其他实例，此时只更新编辑所属的实例）
+        if instance is self._last_rendered_instance:
+            values = list(self.port_tree.item(item, "values"))
+            values[1] = new_value
+            self.port_tree.item(item, values=values)
 
         # 更新实例连接信息
-        prop_name = values[0]
-        port_name = prop_name.split()[0]  # 从属性字符串中提取端口名
+        _, port_name = item.split(':', 1)  # 从行 iid 中取得端口名
 
         # 保留信号名称
-        current_signal = self.current_instance.connections.get(port_name, ("", ""))[1]
-        self.current_instance.connections[port_name] = (new_value, current_signal)
+        current_signal = instance.connections.get(port_name, Connection("", "")).signal_name
+        instance.connections[port_name] = Connection(new_value, current_signal)
 
         # 隐藏下拉框
         self.connection_combobox.place_forget()
@@ -797,21 +1180,21 @@ class VerilogIntegrationTool(tk.Tk):
         if not self.editing_cell or self.editing_cell[2] != "name":
             return
 
-        item, column, _ = self.editing_cell
+        item, column, _, instance = self.editing_cell
         new_value = self.name_entry.get()
 
-        # 更新表格值
-        values = list(self.port_tree.item(item, "values"))
-        values[2] = new_value
-        self.port_tree.item(item, values=values)
+        # 更新表格值（编辑期间表格可能已切换到其他实例，此时只更新编辑所属的实例）
+        if instance is self._last_rendered_instance:
+            values = list(self.port_tree.item(item, "values"))
+            values[2] = new_value
+            self.port_tree.item(item, values=values)
 
         # 更新实例连接信息
-        prop_name = values[0]
-        port_name = prop_name.split()[0]  # 从属性字符串中提取端口名
+        _, port_name = item.split(':', 1)  # 从行 iid 中取得端口名
 
         # 保留连接类型
-        current_type = self.current_instance.connections.get(port_name, ("", ""))[0]
-        self.current_instance.connections[port_name] = (current_type, new_value)
+        current_type = instance.connections.get(port_name, Connection("", "")).conn_type
+        instance.connections[port_name] = Connection(current_type, new_value)
 
         # 隐藏输入框
         self.name_entry.place_forget()
@@ -826,18 +1209,18 @@ class VerilogIntegrationTool(tk.Tk):
         if not self.editing_cell or self.editing_cell[2] != "parameter":
             return
 
-        item, column, _ = self.editing_cell
+        item, column, _, instance = self.editing_cell
         new_value = self.param_entry.get()
 
-        # 更新表格值
-        values = list(self.port_tree.item(item, "values"))
-        values[1] = new_value
-        self.port_tree.item(item, values=values)
+        # 更新表格值（编辑期间表格可能已切换到其他实例，此时只更新编辑所属的实例）
+        if instance is self._last_rendered_instance:
+            values = list(self.port_tree.item(item, "values"))
+            values[1] = new_value
+            self.port_tree.item(item, values=values)
 
         # 更新实例参数值
-        prop_name = values[0]
-        param_name = prop_name.split()[1]  # 从属性字符串中提取参数名
-        self.current_instance.parameter_values[param_name] = new_value
+        _, param_name = item.split(':', 1)  # 从行 iid 中取得参数名
+        instance.parameter_values[param_name] = new_value
 
         # 隐藏输入框
         self.param_entry.place_forget()
@@ -884,23 +1267,21 @@ class VerilogIntegrationTool(tk.Tk):
             return
 
         index = selection[0]
-        module_name = self.module_list.get(index).split()[0]
-        module = self.modules.get(module_name)
-
-        if not module:
-            return
+        module_name = self._module_list_names[index]
 
         # 检查是否有实例使用该模块
-        instances_using = [inst for inst in self.instances if inst.module_ref == module]
-        if instances_using:
+        instance_count = self._instances_per_module.get(module_name, 0)
+        if instance_count:
             messagebox.showerror("Error",
-                f"Cannot delete module '{module_name}' because it has {len(instances_using)} instances.\n"
+                f"Cannot delete module '{module_name}' because it has {instance_count} instances.\n"
                 "Please delete the instances first.")
             return
 
         # 从模块列表中移除
-        del self.modules[module_name]
+        if self.modules.pop(module_name, None) is None:
+            return
         self.module_list.delete(index)
+        del self._module_list_names[index]
         self.log(f"Deleted module: {module_name}")
 
     def refresh_selected_module(self):
@@ -912,20 +1293,34 @@ class VerilogIntegrationTool(tk.Tk):
             return
 
         index = selection[0]
-        module_name = self.module_list.get(index).split()[0]
+        module_name = self._module_list_names[index]
         module = self.modules.get(module_name)
 
         if not module:
             return
 
         try:
+            # 文件自上次解析后未修改时无需重新解析
+            st = os.stat(module.filepath)
+            if module._parse_stamp == (st.st_mtime_ns, st.st_size):
+                self.log(f"Module '{module_name}' is up to date")
+                return
+
             # 重新解析模块文件
             new_module = VerilogParser.parse_verilog_file(module.filepath)
             if new_module:
+                # 端口、参数和宏都未变化时保留原模块对象，已有的引用和索引继续有效
+                unchanged = (new_module.name == module.name
+                             and new_module.ports == module.ports
+                             and new_module.parameters == module.parameters
+                             and new_module.macros == module.macros)
+                if unchanged:
+                    module._parse_stamp = new_module._parse_stamp
+                    new_module = module
                 self.modules[module_name] = new_module
                 self.log(f"Refreshed module: {module_name}")
-                self.log(f"  Ports: {[port['name'] for port in new_module.ports]}")
-                self.log(f"  Parameters: {[param['name'] for param in new_module.parameters]}")
+                self.log(f"  Ports: {[port.name for port in new_module.ports]}")
+                self.log(f"  Parameters: {[param.name for param in new_module.parameters]}")
             else:
                 self.log(f"Error: Could not parse module from {module.filepath}")
         except Exception as e:
@@ -940,27 +1335,19 @@ class VerilogIntegrationTool(tk.Tk):
             return
 
         index = selection[0]
-        instance_name = self.instance_list.get(index)
-
-        # 查找要删除的实例
-        instance_to_delete = None
-        for instance in self.instances:
-            if instance.instance_name == instance_name:
-                instance_to_delete = instance
-                break
-
-        if not instance_to_delete:
-            return
+        instance_to_delete = self._instance_list_refs[index]
+        instance_name = instance_to_delete.instance_name
 
         # 从实例列表中移除
-        self.instances.remove(instance_to_delete)
+        del self.instances[instance_name]
+        self._instances_per_module[instance_to_delete.module_ref.name] -= 1
         self.instance_list.delete(index)
+        del self._instance_list_refs[index]
 
         # 如果当前实例被删除，清空端口表格
         if self.current_instance == instance_to_delete:
             self.current_instance = None
-            for item in self.port_tree.get_children():
-                self.port_tree.delete(item)
+            self._clear_port_tree()
 
         self.log(f"Deleted instance: {instance_name}")
 
@@ -973,17 +1360,8 @@ class VerilogIntegrationTool(tk.Tk):
             return
 
         index = selection[0]
-        old_name = self.instance_list.get(index)
-
-        # 查找要重命名的实例
-        instance_to_rename = None
-        for instance in self.instances:
-            if instance.instance_name == old_name:
-                instance_to_rename = instance
-                break
-
-        if not instance_to_rename:
-            return
+        instance_to_rename = self._instance_list_refs[index]
+        old_name = instance_to_rename.instance_name
 
         # 询问新的实例名称
         new_name = simpledialog.askstring(
@@ -996,12 +1374,13 @@ class VerilogIntegrationTool(tk.Tk):
             return
 
         # 检查新名称是否已存在
-        if any(inst.instance_name == new_name for inst in self.instances):
+        if new_name in self.instances:
             messagebox.showerror("Error", f"Instance name '{new_name}' already exists!")
             return
 
-        # 更新实例名称
+        # 更新实例名称，字典只做名称索引，实例顺序由 _instance_list_refs 保持
         instance_to_rename.instance_name = new_name
+        self.instances[new_name] = self.instances.pop(old_name)
         self.instance_list.delete(index)
         self.instance_list.insert(index, new_name)
         self.instance_list.selection_set(index)
@@ -1023,17 +1402,33 @@ class VerilogIntegrationTool(tk.Tk):
         # 从文件名生成顶层模块名称
         top_name = os.path.basename(filepath).split('.')[0]
 
-        # 生成 Verilog 代码
-        verilog_code = VerilogGenerator.generate_top_module(self.instances, top_name)
-
-        # 添加序列化数据作为注释
-        serialized = self.serialize_data()
-        encoded = base64.b64encode(serialized.encode()).decode()
-        verilog_code += f"\n\n// VERILOG_TOOL_DATA: {encoded}"
+        # 序列化数据作为注释（先 gzip 压缩再 BASE64 编码，减小注释体积）
+        # gzip 头中的时间固定为 0，项目未修改时重复保存得到完全相同的文件
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb', mtime=0) as gz:
+            gz.write(self.serialize_data())
+        compressed = buf.getvalue()
 
-        # 保存到文件
-        with open(filepath, 'w') as f:
-            f.write(verilog_code)
+        # Verilog 代码直接生成到临时文件中，再替换目标文件，保存中断时不会损坏原文件
+        tmp_path = filepath + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                VerilogGenerator.generate_top_module(self._instance_list_refs, top_name, out=f)
+                f.write("\n\n// VERILOG_TOOL_DATA: ")
+                # 分块编码写入，避免再分配一份完整的编码结果
+                for start in range(0, len(compressed), _TOOL_DATA_CHUNK_SIZE):
+                    chunk = compressed[start:start + _TOOL_DATA_CHUNK_SIZE]
+                    f.write(binascii.b2a_base64(chunk, newline=False).decode('ascii'))
+                f.write("\n")
+            os.replace(tmp_path, filepath)
+        except Exception as e:
+            # 保存失败时删除残留的临时文件，原文件保持不变
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            self.log(f"Error saving project: {str(e)}")
+            return
 
         self.log(f"Project saved to {filepath}")
         self.log(f"Top module '{top_name}' generated with {len(self.instances)} instances")
@@ -1050,17 +1445,25 @@ class VerilogIntegrationTool(tk.Tk):
             return
 
         try:
-            with open(filepath, 'r') as f:
-                content = f.read()
+            # 项目数据位于文件末尾，先只读取末尾部分查找，找不到时再读取整个文件
+            with open(filepath, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - _TOOL_DATA_TAIL_SIZE))
+                match = _TOOL_DATA_RE.search(f.read())
+                if not match and size > _TOOL_DATA_TAIL_SIZE:
+                    f.seek(0)
+                    match = _TOOL_DATA_RE.search(f.read())
 
-            # 查找序列化数据
-            match = re.search(r"// VERILOG_TOOL_DATA: (\S+)", content)
             if not match:
                 self.log("Error: No tool data found in file")
                 return
 
             encoded = match.group(1)
-            serialized = base64.b64decode(encoded).decode()
+            serialized = binascii.a2b_base64(encoded)
+            # 旧版本保存的是未压缩的 JSON，根据 gzip 文件头区分
+            if serialized[:2] == b"\x1f\x8b":
+                serialized = gzip.decompress(serialized)
             self.deserialize_data(serialized)
 
             self.log(f"Project loaded from {filepath}")
@@ -1069,59 +1472,59 @@ class VerilogIntegrationTool(tk.Tk):
 
     def serialize_data(self):
         """
-        序列化项目数据，将模块和实例信息转换为 JSON 字符串。
+        序列化项目数据，将模块和实例信息转换为紧凑的 JSON 字节串。
 
-        :return: 序列化后的 JSON 字符串
+        :return: 序列化后的 UTF-8 编码 JSON 字节串
         """
         data = {
-            "modules": {},
-            "instances": []
+            "modules": {name: module.to_dict() for name, module in self.modules.items()},
+            "instances": [instance.to_dict() for instance in self._instance_list_refs]
         }
 
-        # 序列化模块信息
-        for name, module in self.modules.items():
-            data["modules"][name] = {
-                "filepath": module.filepath,
-                "ports": module.ports,
-                "parameters": module.parameters,
-                "macros": module.macros
-            }
-
-        # 序列化实例信息
-        for instance in self.instances:
-            data["instances"].append({
-                "module": instance.module_ref.name,
-                "instance_name": instance.instance_name,
-                "connections": instance.connections,
-                "parameter_values": instance.parameter_values
-            })
-
-        return json.dumps(data)
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
 
     def deserialize_data(self, serialized):
         """
-        反序列化项目数据，从 JSON 字符串恢复模块和实例信息。
+        反序列化项目数据，从 JSON 数据恢复模块和实例信息。
 
-        :param serialized: 序列化后的 JSON 字符串
+        :param serialized: 序列化后的 JSON 字符串或 UTF-8 字节串
         """
-        data = json.loads(serialized)
+        if orjson is not None:
+            data = orjson.loads(serialized)
+        else:
+            data = json.loads(serialized)
 
         # 清空当前数据
         self.modules = {}
-        self.instances = []
+        self.instances = {}
+        self._instances_per_module = Counter()
         self.module_list.delete(0, tk.END)
+        self._module_list_names = []
         self.instance_list.delete(0, tk.END)
+        self._instance_list_refs = []
 
         # 重新创建模块
         for name, mod_data in data["modules"].items():
             module = VerilogModule(name, mod_data["filepath"])
-            module.ports = mod_data["ports"]
-            module.parameters = mod_data["parameters"]
+            for port in mod_data["ports"]:
+                module.add_port(port['name'], port['direction'], port['dtype'],
+                                port['width'], port.get('dimensions'))
+            for param in mod_data["parameters"]:
+                module.add_parameter(param['name'], param['value'], param.get('type'))
             module.macros = mod_data["macros"]
             self.modules[name] = module
-            self.module_list.insert(tk.END, str(module))
+            self._module_list_names.append(name)
+
+        # 一次性插入所有模块，避免逐条插入带来的重复刷新
+        if self._module_list_names:
+            self.module_list.insert(tk.END, *(str(self.modules[name]) for name in self._module_list_names))
 
         # 重新创建实例
+        # Connection 为不可变元组，相同的连接在所有实例间共享同一个对象
+        connection_pool = {}
+        new_instances = []
         for inst_data in data["instances"]:
             module = self.modules.get(inst_data["module"])
             if not module:
@@ -1130,13 +1533,23 @@ class VerilogIntegrationTool(tk.Tk):
             instance = ModuleInstance(module, inst_data["instance_name"])
 
             # 恢复连接信息
-            instance.connections = inst_data["connections"]
+            connections = {}
+            for port_name, conn in inst_data["connections"].items():
+                connection = Connection(*conn)
+                connections[sys.intern(port_name)] = connection_pool.setdefault(connection, connection)
+            instance.connections = connections
 
             # 恢复参数值
             instance.parameter_values = inst_data["parameter_values"]
 
-            self.instances.append(instance)
-            self.instance_list.insert(tk.END, instance.instance_name)
+            new_instances.append(instance)
+
+        # 循环结束后一次性建立实例字典、列表行和各模块的实例计数
+        self.instances.update((instance.instance_name, instance) for instance in new_instances)
+        if self.instances:
+            self.instance_list.insert(tk.END, *self.instances)
+        self._instance_list_refs = list(self.instances.values())
+        self._instances_per_module.update(instance.module_ref.name for instance in self._instance_list_refs)
 
         self.log(f"Loaded {len(self.modules)} modules and {len(self.instances)} instances")
 